@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 """Debug script to analyze MBOX parsing."""
 
+import heapq
+from collections import Counter
+
 from zomato_analyzer.parsers.mbox_parser import MBoxParser
 from zomato_analyzer.parsers.zomato import ZomatoEmailParser
 
@@ -11,35 +14,34 @@ def debug_mbox(mbox_path: str):
     validated = 0
     failed_parse = 0
     failed_validate = 0
-    skipped_subjects = {}
+    skipped_subjects = Counter()
+    
+    # Bind hot lookups once rather than per message
+    validate = MBoxParser.validate_email
+    extract = ZomatoEmailParser.extract_order
     
-    for subject, from_addr, body in parser.parse():
+    # Headers first: rejected messages never have their body decoded
+    for subject, from_addr, email_date, raw in parser.iter_headers():
         # Check validation
-        is_valid = MBoxParser.validate_email(subject, from_addr)
-        
-        if not is_valid:
+        if not validate(subject, from_addr):
             failed_validate += 1
-            if subject not in skipped_subjects:
-                skipped_subjects[subject] = 0
             skipped_subjects[subject] += 1
             continue
         
         validated += 1
         
         # Try to extract order
-        order = ZomatoEmailParser.extract_order(subject, from_addr, body, None)
+        order = extract(subject, from_addr, parser.decode_body(raw), email_date)
         
         if not order:
             failed_parse += 1
-            if subject not in skipped_subjects:
-                skipped_subjects[subject] = 0
             skipped_subjects[subject] += 1
     
     print(f"Total emails validated: {validated}")
     print(f"Failed to parse (passed validation): {failed_parse}")
     print(f"Failed validation: {failed_validate}")
     print("Top skipped subjects:")
-    for subject, count in sorted(skipped_subjects.items(), key=lambda x: x[1], reverse=True)[:20]:
+    for subject, count in heapq.nlargest(20, skipped_subjects.items(), key=lambda x: x[1]):
         print(f"  {count:3d} - {subject[:80]}")
 
 if __name__ == '__main__':
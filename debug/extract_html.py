@@ -4,9 +4,12 @@
 from zomato_analyzer.parsers.mbox_parser import MBoxParser
 import re
 
+_ORDER_ID_RE = re.compile(r'\b\d{7,}\b')
+_PRICE_RE = re.compile(r'[₹Rs]*\s*(\d+\.?\d*)')
+
 parser = MBoxParser('Zomato.mbox')
 
-for subject, from_addr, body in parser.parse():
+for subject, from_addr, body, email_date in parser.parse():
     if 'Pro Plus order from LunchBox' in subject:
         # Look for order ID
         print("Looking for order ID...")
@@ -16,11 +19,12 @@ for subject, from_addr, body in parser.parse():
             print(f"Context: ...{body[max(0,idx-50):idx+100]}...")
         
         # Look for numbers that might be order ID (7+ digits)
-        numbers = re.findall(r'\b\d{7,}\b', body[:5000])
+        # endpos bounds the scan without slicing a copy of the body
+        numbers = _ORDER_ID_RE.findall(body, 0, 5000)
         print(f"\nFound numbers: {numbers[:10]}")
         
         # Look for price patterns
-        prices = re.findall(r'[₹Rs]*\s*(\d+\.?\d*)', body[:3000])
+        prices = _PRICE_RE.findall(body, 0, 3000)
         print(f"\nFound prices: {prices[:10]}")
         
         break
@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
 """Generate sample MBOX file for testing."""
 
-import mailbox
+import time
 from datetime import datetime, timedelta
+from email.generator import BytesGenerator
+from email.message import EmailMessage
+from io import BytesIO
 from pathlib import Path
 
 ZOMATO_EMAIL = "orders@zomato.com"
@@ -121,13 +124,12 @@ Zomato
 def generate_sample_mbox(output_file: str = "sample_zomato.mbox"):
     """Generate sample MBOX file."""
     output_path = Path(output_file)
+    from_line = f"From MAILER-DAEMON {time.asctime(time.gmtime())}\n".encode()
     
-    # Create MBOX file
-    mbox = mailbox.mbox(str(output_path))
-    
+    # Build the whole MBOX in memory and write it out once
+    messages = []
     for idx, email_data in enumerate(SAMPLE_EMAILS):
         # Create message
-        from email.message import EmailMessage
         msg = EmailMessage()
         
         msg['Subject'] = email_data['subject']
@@ -137,10 +139,12 @@ def generate_sample_mbox(output_file: str = "sample_zomato.mbox"):
         msg['Message-ID'] = f'<{idx}@zomato.com>'
         msg.set_content(email_data['body'])
         
-        # Add to mbox
-        mbox.add(msg)
+        # Serialize with body lines starting "From " escaped, as mailbox does
+        raw = BytesIO()
+        BytesGenerator(raw, mangle_from_=True).flatten(msg)
+        messages.append(from_line + raw.getvalue() + b"\n")
     
-    mbox.close()
+    output_path.write_bytes(b"".join(messages))
     
     print(f"Sample MBOX file created: {output_path}")
     print(f"Total emails: {len(SAMPLE_EMAILS)}")
@@ -0,0 +1,59 @@
+"""Tests for OrderDatabase schema and the shipped SQL queries."""
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from zomato_analyzer.db.database import OrderDatabase
+from zomato_analyzer.models.order import Order
+
+
+def read_query(name: str) -> str:
+    """Return a queries/ file without its sqlite3 shell dot-commands."""
+    text = (ROOT / 'queries' / name).read_text(encoding='utf-8')
+    return '\n'.join(line for line in text.splitlines() if not line.startswith('.'))
+
+
+class PeriodColumnsTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'orders.db')
+        self.db = OrderDatabase(self.path)
+        # The same calendar month in two different years
+        for order_id, when, total in [('ORD10001', datetime(2023, 3, 5, 12, 0), 100.0),
+                                      ('ORD10002', datetime(2024, 3, 9, 13, 0), 200.0),
+                                      ('ORD10003', datetime(2024, 4, 1, 20, 0), 50.0)]:
+            self.db.insert_order(Order(order_id=order_id, order_date=when, restaurant_name='Cafe',
+                                       amount=total, total_amount=total))
+
+    def tearDown(self):
+        self.db.close()
+        self.tmp.cleanup()
+
+    def test_shipped_month_queries_group_by_year_month(self):
+        conn = sqlite3.connect(self.path)
+        try:
+            spend = conn.execute(read_query('monthly_spend.sql')).fetchall()
+            counts = conn.execute(read_query('orders_per_month.sql')).fetchall()
+        finally:
+            conn.close()
+        self.assertEqual(spend, [('2023-03', 100.0), ('2024-03', 200.0), ('2024-04', 50.0)])
+        self.assertEqual(counts, [('2023-03', 1), ('2024-03', 1), ('2024-04', 1)])
+
+    def test_sum_group_by(self):
+        self.assertEqual(self.db.sum_group_by('year'), [(2023, 1, 100.0), (2024, 2, 250.0)])
+        self.assertEqual(self.db.sum_group_by('month', 2024), [(3, 1, 200.0), (4, 1, 50.0)])
+        self.assertEqual(self.db.sum_group_by('month_year'),
+                         [('2023-03', 1, 100.0), ('2024-03', 1, 200.0), ('2024-04', 1, 50.0)])
+        with self.assertRaises(ValueError):
+            self.db.sum_group_by('order_date')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+"""Tests for the JSON export in main.py."""
+import json
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import export_json
+from zomato_analyzer.db.database import OrderDatabase
+from zomato_analyzer.models.order import Order
+
+
+class ExportJsonTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = OrderDatabase(os.path.join(self.tmp.name, 'orders.db'))
+
+    def tearDown(self):
+        self.db.close()
+        self.tmp.cleanup()
+
+    def test_non_ascii_restaurant_name(self):
+        name = 'Café Mocha — चाय ₹'
+        self.db.insert_order(Order(
+            order_id='ORD12345',
+            order_date=datetime(2024, 3, 5, 19, 30),
+            restaurant_name=name,
+            amount=250.0,
+            delivery_fee=30.0,
+            discount=10.0,
+            total_amount=270.0,
+        ))
+
+        output = export_json(self.db, os.path.join(self.tmp.name, 'out', 'export.json'))
+
+        # Written as UTF-8 regardless of the locale's default encoding
+        text = Path(output).read_bytes().decode('utf-8')
+        self.assertNotIn('\\u', text)
+        data = json.loads(text)
+        self.assertEqual(data['orders'][0]['restaurant'], name)
+        self.assertEqual(data['top_restaurants'][0]['restaurant'], name)
+        self.assertEqual(data['year_wise_orders'], {'2024': 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
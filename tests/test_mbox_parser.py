@@ -0,0 +1,118 @@
+"""Tests for MBoxParser."""
+import mailbox
+import os
+import sys
+import tempfile
+import unittest
+from email.message import EmailMessage
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from zomato_analyzer.parsers.mbox_parser import MBoxParser
+
+ORDER_BODY = """Thank you for ordering from Cafe {n}
+
+Order ID: ORD{n}
+Date: 15 Jan 2024, 2:30 PM
+
+Total Amount: ₹{n}.00
+"""
+
+
+def order_message(n: int) -> EmailMessage:
+    msg = EmailMessage()
+    msg['Subject'] = f'Your Zomato order ORD{n} is confirmed'
+    msg['From'] = 'orders@zomato.com'
+    msg['Date'] = 'Wed, 15 Jan 2024 14:30:00 +0530'
+    msg.set_content(ORDER_BODY.format(n=n))
+    return msg
+
+
+def newsletter_message() -> EmailMessage:
+    msg = EmailMessage()
+    msg['Subject'] = 'This week on Zomato'
+    msg['From'] = 'offers@zomato.com'
+    msg.set_content('Flat 50% off this weekend.')
+    return msg
+
+
+class IterRawMessagesTest(unittest.TestCase):
+    """The mmap splitter must cut messages exactly where mailbox.mbox does."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def assertSplitsLikeMailbox(self, data: bytes, count: int):
+        path = os.path.join(self.tmp.name, 'split.mbox')
+        with open(path, 'wb') as f:
+            f.write(data)
+        box = mailbox.mbox(path, create=False)
+        try:
+            expected = [box.get_bytes(key) for key in box.keys()]
+        finally:
+            box.close()
+        self.assertEqual(list(MBoxParser(path).iter_raw_messages()), expected)
+        self.assertEqual(len(expected), count)
+
+    def test_crlf_line_endings(self):
+        self.assertSplitsLikeMailbox(
+            b'From a Mon Jan  1 00:00:00 2024\r\nSubject: x\r\n\r\nbody\r\n\r\n'
+            b'From b Mon Jan  1 00:00:00 2024\r\nSubject: y\r\n\r\nb2\r\n', 2)
+
+    def test_leading_junk_before_first_from(self):
+        self.assertSplitsLikeMailbox(
+            b'preamble\nnot From a separator\n\nFrom a\nSubject: x\n\nbody\n\n'
+            b'From b\nSubject: y\n\nb2\n', 2)
+
+    def test_junk_without_from_line(self):
+        self.assertSplitsLikeMailbox(b'junk\nmore junk\n', 0)
+
+    def test_trailing_blank_lines(self):
+        self.assertSplitsLikeMailbox(b'From a\nSubject: x\n\nbody\n\n', 1)
+        self.assertSplitsLikeMailbox(b'From a\nSubject: x\n\nbody\n\n\n\nFrom b\n\nb2\n\n\n', 2)
+        self.assertSplitsLikeMailbox(b'From a\nSubject: x\n\nno trailing newline', 1)
+
+    def test_from_lines_in_body(self):
+        # Escaped and near-miss From lines stay in the body; a bare one splits
+        self.assertSplitsLikeMailbox(
+            b'From a\nSubject: x\n\n>From the kitchen\n>>From the rider\n'
+            b'From:header-like\nfrom lowercase\n From indented\nFrom\n\n'
+            b'From b\nSubject: y\n\nFrom unescaped line\nend\n', 3)
+
+    def test_empty_file(self):
+        self.assertSplitsLikeMailbox(b'', 0)
+
+
+class ExtractOrdersTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'orders.mbox')
+        box = mailbox.mbox(self.path)
+        # Enough messages for several worker chunks, with non-orders mixed in
+        for n in range(100000, 100150):
+            box.add(newsletter_message() if n % 7 == 0 else order_message(n))
+        box.flush()
+        box.close()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_workers_match_in_process(self):
+        parser = MBoxParser(self.path)
+        serial = list(parser.extract_orders())
+        parallel = list(parser.extract_orders(workers=2))
+
+        self.assertEqual(len(serial), 150)
+        self.assertEqual(sum(order is None for _, order in serial), 22)
+        self.assertEqual([headers for headers, _ in parallel], [headers for headers, _ in serial])
+        self.assertEqual([o and (o.order_id, o.total_amount) for _, o in parallel],
+                         [o and (o.order_id, o.total_amount) for _, o in serial])
+        self.assertEqual(serial[0][1].order_id, 'ORD100000')
+        self.assertEqual(serial[0][1].total_amount, 100000.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+"""Tests for ZomatoEmailParser date handling."""
+import os
+import sys
+import unittest
+from datetime import datetime
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from zomato_analyzer.parsers.zomato import _parse_date_string
+
+# The strptime formats _parse_date_string replaced, tried in this order
+OLD_DATE_FORMATS = [
+    '%d %b %Y, %I:%M %p',
+    '%d %B %Y, %I:%M %p',
+    '%d-%m-%Y, %H:%M',
+    '%d/%m/%Y, %H:%M',
+    '%d %b %Y',
+    '%d %B %Y',
+    '%d %b %Y, %H:%M',
+    '%d %B %Y, %H:%M',
+    '%d %b, %I:%M %p',
+    '%d %B, %I:%M %p',
+]
+
+
+def old_parse_date_string(date_str: str, year: Optional[int] = None) -> Optional[datetime]:
+    """The strptime loop that used to run for every order date."""
+    for fmt in OLD_DATE_FORMATS:
+        try:
+            parsed = datetime.strptime(date_str, fmt)
+        except ValueError:
+            continue
+        if '%Y' not in fmt and year:
+            parsed = parsed.replace(year=year)
+        return parsed
+    return None
+
+
+class ParseDateStringTest(unittest.TestCase):
+    def assertMatchesOld(self, date_str: str, expected: Optional[datetime], year: Optional[int] = None):
+        self.assertEqual(old_parse_date_string(date_str, year), expected, date_str)
+        self.assertEqual(_parse_date_string(date_str, year), expected, date_str)
+
+    def test_twelve_am_and_pm(self):
+        self.assertMatchesOld('15 Jan 2024, 12:05 AM', datetime(2024, 1, 15, 0, 5))
+        self.assertMatchesOld('15 Jan 2024, 12:05 PM', datetime(2024, 1, 15, 12, 5))
+        self.assertMatchesOld('15 January 2024, 12:00 am', datetime(2024, 1, 15, 0, 0))
+        self.assertMatchesOld('15 Jan, 12:30 pm', datetime(2024, 1, 15, 12, 30), year=2024)
+        self.assertMatchesOld('15 Jan 2024, 13:05 PM', None)
+        self.assertMatchesOld('15 Jan 2024, 00:30 AM', None)
+
+    def test_impossible_days_are_rejected(self):
+        self.assertMatchesOld('31 Feb 2024', None)
+        self.assertMatchesOld('31 Feb 2024, 10:30 PM', None)
+        self.assertMatchesOld('29 Feb 2023', None)
+        self.assertMatchesOld('29-02-2023, 10:30', None)
+        self.assertMatchesOld('29 Feb 2024', datetime(2024, 2, 29))
+        self.assertMatchesOld('31 Apr 2024', None)
+
+    def test_year_less_dates(self):
+        self.assertMatchesOld('5 Mar, 7:45 PM', datetime(2023, 3, 5, 19, 45), year=2023)
+        self.assertMatchesOld('5 March, 7:45 PM', datetime(1900, 3, 5, 19, 45))
+        # A time is required when the year is missing
+        self.assertMatchesOld('5 Mar', None, year=2023)
+        # Parsed against 1900 before the email's year is applied
+        self.assertMatchesOld('29 Feb, 10:00 AM', None, year=2024)
+
+    def test_dash_and_slash_numeric_dates(self):
+        self.assertMatchesOld('05-03-2024, 19:45', datetime(2024, 3, 5, 19, 45))
+        self.assertMatchesOld('05/03/2024, 19:45', datetime(2024, 3, 5, 19, 45))
+        self.assertMatchesOld('5/3/2024, 7:05', datetime(2024, 3, 5, 7, 5))
+        self.assertMatchesOld('13-13-2024, 10:00', None)
+        # Mixed separators and dates without a time never matched
+        self.assertMatchesOld('05-03/2024, 19:45', None)
+        self.assertMatchesOld('05-03-2024', None)
+
+    def test_surrounding_whitespace(self):
+        # The caller strips captures; strptime only let %d take one leading space
+        self.assertMatchesOld(' 5 Mar 2024', datetime(2024, 3, 5))
+        for date_str in [' 15 Mar 2024', '  5 Mar 2024', '\t15 Mar 2024', '15 Mar 2024 ',
+                         '15 Mar 2024, 7:45 PM\n']:
+            self.assertMatchesOld(date_str, None)
+        # Inner runs of whitespace are accepted
+        self.assertMatchesOld('15  Mar   2024', datetime(2024, 3, 15))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,6 +2,39 @@ import os
 import re
 from collections import Counter, defaultdict
 
+SUBJ_RE = re.compile(rb'^Subject:\s*(.*)', re.MULTILINE)
+# One group per category, in priority order (lowest group index wins)
+KIND_RE = re.compile(
+    rb'(refund)|(renewed|gold|membership)|(pro plus|pro \+)|(your order)',
+    re.IGNORECASE
+)
+# Category of each KIND_RE group, indexed by match.lastindex
+KINDS = (None, 'refund', 'membership', 'pro_plus', 'order_subject')
+INV_RE = re.compile(rb'\.pdf|invoice', re.IGNORECASE)
+STYLE_RE = re.compile(rb'<style', re.IGNORECASE)
+
+
+def classify(txt: bytes, subj: str) -> str:
+    """Map a failed sample to its template category."""
+    found = {KINDS[m.lastindex] for m in KIND_RE.finditer(txt)}
+    kind = 'other'
+    if 'refund' in found:
+        kind = 'refund'
+    elif 'membership' in found:
+        kind = 'membership'
+    elif 'login' in subj:
+        kind = 'security'
+    elif 'pro_plus' in found:
+        kind = 'pro_plus'
+    elif 'order from' in subj.lower() or 'order_subject' in found:
+        kind = 'order_subject'
+    if INV_RE.search(txt):
+        kind = kind + '|invoice'
+    if len(txt.splitlines()) > 200 and STYLE_RE.search(txt):
+        kind = kind + '|html-styled'
+    return kind
+
+
 def main():
     p = os.path.join(os.path.dirname(__file__), 'failed_samples')
     if not os.path.isdir(p):
@@ -13,29 +46,15 @@ def main():
     for fn in files:
         path = os.path.join(p, fn)
         try:
-            txt = open(path, encoding='utf-8', errors='ignore').read()
+            with open(path, 'rb') as f:
+                txt = f.read()
         except Exception:
-            txt = ''
+            txt = b''
         subj = ''
-        m = re.search(r'Subject:\s*(.*)', txt)
+        m = SUBJ_RE.search(txt)
         if m:
-            subj = m.group(1).strip()
-        kind = 'other'
-        low = txt.lower()
-        if 'refund' in subj.lower() or 'refund' in low:
-            kind = 'refund'
-        elif 'renewed' in low or 'gold' in low or 'membership' in low:
-            kind = 'membership'
-        elif 'login alert' in subj or 'login' in subj:
-            kind = 'security'
-        elif 'pro plus' in subj.lower() or 'pro plus' in low or 'pro +' in low:
-            kind = 'pro_plus'
-        elif 'order from' in subj.lower() or 'your order' in low:
-            kind = 'order_subject'
-        if '.pdf' in low or 'download order invoice' in low or 'invoice' in low:
-            kind = kind + '|invoice'
-        if len(txt.splitlines()) > 200 and '<style' in low:
-            kind = kind + '|html-styled'
+            subj = m.group(1).strip().decode('utf-8', errors='ignore')
+        kind = classify(txt, subj)
         templates[kind] += 1
         details[kind].append(subj)
 
@@ -6,34 +6,49 @@ out_dir = os.path.join(os.path.dirname(__file__), '..', 'data', 'failed_samples'
 os.makedirs(out_dir, exist_ok=True)
 parser = MBoxParser(os.path.join(os.path.dirname(__file__), '..', 'Zomato.mbox'))
 
+# Keyed by subject template so per-order variants share one bucket
 counts = collections.Counter()
 saved = collections.Counter()
+exemplars = {}
+
+
+_SAFE_RE = re.compile(r'[^0-9A-Za-z _.\-]+')
+_ORDER_RE = re.compile(r'\bORD\d\w*|#\w+')
+_NUM_RE = re.compile(r'\d+')
 
 
 def safe_name(s):
-    s = re.sub(r'[^0-9A-Za-z _\-\\.]+', '_', (s or 'no_subject'))
-    return s[:120]
+    return _SAFE_RE.sub('_', s or 'no_subject')[:120]
+
+
+def template(s):
+    """Collapse order IDs and numbers so similar subjects group together."""
+    return _NUM_RE.sub('N', _ORDER_RE.sub('ID', s or ''))
 
 idx = 0
-for subject, from_addr, body in parser.parse():
+for subject, from_addr, body, email_date in parser.parse():
     idx += 1
-    order = ZomatoEmailParser.extract_order(subject or '', from_addr or '', body or '')
+    order = ZomatoEmailParser.extract_order(subject or '', from_addr or '', body or '', email_date)
     if not order:
-        counts[subject] += 1
-        if saved[subject] < 3:
-            fname = f"{saved[subject]+1:02d}_{safe_name(subject)}_{idx}.html"
+        key = template(subject)
+        counts[key] += 1
+        exemplars.setdefault(key, subject)
+        if saved[key] < 3:
+            fname = f"{saved[key]+1:02d}_{safe_name(subject)}_{idx}.html"
             path = os.path.join(out_dir, fname)
             try:
-                with open(path, 'wb') as f:
-                    f.write((body or '').encode('utf-8', errors='ignore'))
+                with open(path, 'w', encoding='utf-8', errors='ignore') as f:
+                    f.write(body or '')
             except Exception:
                 with open(path, 'wb') as f:
                     f.write(b'')
-            saved[subject] += 1
+            saved[key] += 1
 
 print('Total failed emails:', sum(counts.values()))
 print('\nTop failing subjects:')
-for subj, c in counts.most_common(60):
-    print(f'{c:4d} - {subj}')
+for key, c in counts.most_common(60):
+    print(f'{c:4d} - {key}')
+    if exemplars[key] != key:
+        print(f'       e.g. {exemplars[key]}')
 
 print('\nSaved samples to', out_dir)
@@ -1,10 +1,12 @@
 #!/usr/bin/env python3
 """Dump failed-to-parse Zomato emails for inspection.
 
-Usage: python tools/dump_failed_samples.py [mbox_path] [max_samples]
+Usage: python tools/dump_failed_samples.py [mbox_path] [max_samples] [--text]
+
+Pass --text to also write a plain-text conversion next to each sample
+(tools/analyze_failed_samples.py reads those .txt files).
 """
-import os
-import sys
+import argparse
 import re
 from pathlib import Path
 
@@ -16,7 +18,7 @@ def sanitize(filename: str) -> str:
     return re.sub(r"[^0-9A-Za-z_.-]", "_", filename)[:120]
 
 
-def dump_failed(mbox_path: str, max_samples: int = 50):
+def dump_failed(mbox_path: str, max_samples: int = 50, with_text: bool = False):
     out_dir = Path('tools/failed_samples')
     out_dir.mkdir(parents=True, exist_ok=True)
 
@@ -24,12 +26,10 @@ def dump_failed(mbox_path: str, max_samples: int = 50):
     saved = 0
     total = 0
 
-    for subject, from_addr, body in parser.parse():
+    for subject, from_addr, body, email_date in parser.parse(zomato_only=True):
         total += 1
-        if not MBoxParser.validate_email(subject, from_addr):
-            continue
 
-        order = ZomatoEmailParser.extract_order(subject, from_addr, body, None)
+        order = ZomatoEmailParser.extract_order(subject, from_addr, body, email_date)
         if order:
             continue
 
@@ -37,22 +37,22 @@ def dump_failed(mbox_path: str, max_samples: int = 50):
         saved += 1
         name = f"{saved:03d}_{sanitize(subject or 'no_subject')}.html"
         path = out_dir / name
+        header = f"Subject: {subject}\nFrom: {from_addr}\n\n"
         try:
             with open(path, 'w', encoding='utf-8') as f:
-                f.write(f"Subject: {subject}\nFrom: {from_addr}\n\n")
-                f.write(body)
+                f.write(header + body)
         except Exception as e:
             print('Failed to write', path, e)
 
-        # Also save converted plain text for quick scanning
-        try:
-            clean = ZomatoEmailParser._convert_html_to_text(body)
-            tpath = out_dir / (name + '.txt')
-            with open(tpath, 'w', encoding='utf-8') as f:
-                f.write(f'Subject: {subject}\nFrom: {from_addr}\n\n')
-                f.write(clean)
-        except Exception:
-            pass
+        # Optionally save converted plain text for quick scanning
+        if with_text:
+            try:
+                clean = ZomatoEmailParser._convert_html_to_text(body)
+                tpath = out_dir / (name + '.txt')
+                with open(tpath, 'w', encoding='utf-8') as f:
+                    f.write(header + clean)
+            except Exception:
+                pass
 
         if saved >= max_samples:
             break
@@ -61,6 +61,9 @@ def dump_failed(mbox_path: str, max_samples: int = 50):
 
 
 if __name__ == '__main__':
-    mbox = sys.argv[1] if len(sys.argv) > 1 else 'Zomato.mbox'
-    max_samples = int(sys.argv[2]) if len(sys.argv) > 2 else 50
-    dump_failed(mbox, max_samples)
+    ap = argparse.ArgumentParser(description='Dump failed-to-parse Zomato emails')
+    ap.add_argument('mbox', nargs='?', default='Zomato.mbox', help='Path to MBOX file')
+    ap.add_argument('max_samples', nargs='?', type=int, default=50, help='Maximum samples to save')
+    ap.add_argument('--text', action='store_true', help='Also write a plain-text .txt per sample')
+    args = ap.parse_args()
+    dump_failed(args.mbox, args.max_samples, args.text)
@@ -16,11 +16,9 @@ def main():
 
     skipped = []
     total = 0
-    for subject, from_addr, body in parser.parse():
-        if not MBoxParser.validate_email(subject or '', from_addr or ''):
-            continue
+    for subject, from_addr, body, email_date in parser.parse(zomato_only=True):
         total += 1
-        order = ZomatoEmailParser.extract_order(subject or '', from_addr or '', body or '')
+        order = ZomatoEmailParser.extract_order(subject or '', from_addr or '', body or '', email_date)
         if order is None:
             subj = (subject or '').strip()
             skipped.append(subj or '(no subject)')
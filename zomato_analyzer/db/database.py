@@ -2,7 +2,7 @@
 import sqlite3
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Optional, Iterable, Set, Tuple
+from typing import List, Optional, Iterable, Iterator, Set, Tuple
 
 from zomato_analyzer.models.order import Order
 
@@ -10,11 +10,64 @@ from zomato_analyzer.models.order import Order
 class OrderDatabase:
     """SQLite database for storing Zomato orders."""
     
+    # Fixed statement text so sqlite3's statement cache prepares each once
+    _INSERT_SQL = """
+        INSERT INTO orders (
+            order_id, order_date, restaurant_name, amount,
+            delivery_fee, discount, total_amount, status,
+            payment_method, delivery_location, order_items,
+            raw_email_body, email_date, created_at, updated_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    # Keep the original row (id, created_at) and refresh everything else
+    _UPSERT_SQL = _INSERT_SQL + """
+        ON CONFLICT(order_id) DO UPDATE SET
+            order_date = excluded.order_date,
+            restaurant_name = excluded.restaurant_name,
+            amount = excluded.amount,
+            delivery_fee = excluded.delivery_fee,
+            discount = excluded.discount,
+            total_amount = excluded.total_amount,
+            status = excluded.status,
+            payment_method = excluded.payment_method,
+            delivery_location = excluded.delivery_location,
+            order_items = excluded.order_items,
+            raw_email_body = excluded.raw_email_body,
+            email_date = excluded.email_date,
+            updated_at = excluded.updated_at
+    """
+    _INSERT_IGNORE_SQL = _INSERT_SQL + "ON CONFLICT(order_id) DO NOTHING"
+    
+    # Rows pulled from SQLite per fetchmany() when streaming orders
+    FETCH_SIZE = 1000
+    # Order columns for bulk reads; the stored email body is by far the
+    # largest column and nothing reading every order needs it
+    _ORDER_COLUMNS = """
+        order_id, order_date, restaurant_name, amount, delivery_fee,
+        discount, total_amount, status, payment_method, delivery_location,
+        order_items, NULL AS raw_email_body, email_date
+    """
+    
+    # Period columns derived from order_date. It is stored as local ISO text,
+    # so slice it: strftime() would shift offset-aware values to UTC. The
+    # names must not be plain year/month: SQLite resolves GROUP BY month to
+    # a table column before a result alias, which breaks the queries/ files.
+    _PERIOD_COLUMNS = {
+        'order_year': "INTEGER GENERATED ALWAYS AS (CAST(substr(order_date, 1, 4) AS INTEGER)) VIRTUAL",
+        'order_month': "INTEGER GENERATED ALWAYS AS (CAST(substr(order_date, 6, 2) AS INTEGER)) VIRTUAL",
+        'order_ym': "TEXT GENERATED ALWAYS AS (substr(order_date, 1, 7)) VIRTUAL",
+    }
+    # sum_group_by period keys and the column each one groups by
+    _PERIODS = {'year': 'order_year', 'month': 'order_month', 'month_year': 'order_ym'}
+    # Generated columns under their earlier, clashing names
+    _LEGACY_PERIOD_COLUMNS = ('year', 'month', 'month_year')
+    
     def __init__(self, db_path: str = "zomato_orders.db"):
         """Initialize database connection."""
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self.connection = None
+        self._explicit_txn = False
         self.init_db()
     
     def init_db(self):
@@ -58,6 +111,27 @@ class OrderDatabase:
                 ON orders(order_id)
             """)
             
+            # Add period columns to databases created before they existed.
+            # table_xinfo marks generated columns with hidden = 2 or 3.
+            columns = {row['name']: row['hidden'] for row in cursor.execute("PRAGMA table_xinfo(orders)")}
+            legacy = [name for name in self._LEGACY_PERIOD_COLUMNS if columns.get(name) in (2, 3)]
+            if legacy:
+                cursor.execute("DROP INDEX IF EXISTS idx_year")
+                cursor.execute("DROP INDEX IF EXISTS idx_year_month")
+                for name in legacy:
+                    cursor.execute(f"ALTER TABLE orders DROP COLUMN {name}")
+            for name, definition in self._PERIOD_COLUMNS.items():
+                if name not in columns:
+                    cursor.execute(f"ALTER TABLE orders ADD COLUMN {name} {definition}")
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_order_year 
+                ON orders(order_year)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_order_year_month 
+                ON orders(order_year, order_month)
+            """)
+            
             conn.commit()
     
     def get_connection(self):
@@ -65,12 +139,21 @@ class OrderDatabase:
         if self.connection is None:
             self.connection = sqlite3.connect(str(self.db_path))
             self.connection.row_factory = sqlite3.Row
+            # WAL + NORMAL sync: commits no longer fsync the main db file
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.execute("PRAGMA temp_store=MEMORY")
+            # 64 MiB page cache and memory-mapped reads for analytics scans
+            self.connection.execute("PRAGMA cache_size=-65536")
+            self.connection.execute("PRAGMA mmap_size=268435456")
         return self.connection
     
     def insert_order(self, order: Order, upsert: bool = True) -> bool:
         """
         Insert or update an order (idempotent).
         
+        Commits immediately unless called between `begin()` and `commit()`.
+        
         Args:
             order: Order object to insert
             upsert: If True, update existing order; if False, skip existing
@@ -79,84 +162,51 @@ class OrderDatabase:
             True if inserted/updated, False if already exists and upsert=False
         """
         now = datetime.now(timezone.utc).isoformat()
+        conn = self.get_connection()
+        sql = self._UPSERT_SQL if upsert else self._INSERT_IGNORE_SQL
+        cursor = conn.execute(sql, self._order_params(order, now))
         
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Check if order exists
-            cursor.execute(
-                "SELECT id FROM orders WHERE order_id = ?",
-                (order.order_id,)
-            )
-            existing = cursor.fetchone()
-            
-            if existing:
-                if not upsert:
-                    return False
-                
-                # Update existing order
-                cursor.execute("""
-                    UPDATE orders SET
-                        order_date = ?,
-                        restaurant_name = ?,
-                        amount = ?,
-                        delivery_fee = ?,
-                        discount = ?,
-                        total_amount = ?,
-                        status = ?,
-                        payment_method = ?,
-                        delivery_location = ?,
-                        order_items = ?,
-                        raw_email_body = ?,
-                        email_date = ?,
-                        updated_at = ?
-                    WHERE order_id = ?
-                """, (
-                    order.order_date.isoformat(),
-                    order.restaurant_name,
-                    order.amount,
-                    order.delivery_fee,
-                    order.discount,
-                    order.total_amount,
-                    order.status,
-                    order.payment_method,
-                    order.delivery_location,
-                    order.order_items,
-                    order.raw_email_body,
-                    order.email_date.isoformat() if order.email_date else None,
-                    now,
-                    order.order_id
-                ))
-            else:
-                # Insert new order
-                cursor.execute("""
-                    INSERT INTO orders (
-                        order_id, order_date, restaurant_name, amount,
-                        delivery_fee, discount, total_amount, status,
-                        payment_method, delivery_location, order_items,
-                        raw_email_body, email_date, created_at, updated_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    order.order_id,
-                    order.order_date.isoformat(),
-                    order.restaurant_name,
-                    order.amount,
-                    order.delivery_fee,
-                    order.discount,
-                    order.total_amount,
-                    order.status,
-                    order.payment_method,
-                    order.delivery_location,
-                    order.order_items,
-                    order.raw_email_body,
-                    order.email_date.isoformat() if order.email_date else None,
-                    now,
-                    now
-                ))
-            
+        if not self._explicit_txn:
             conn.commit()
-            return True
-
+        return cursor.rowcount > 0
+    
+    def insert_orders_bulk(self, orders: Iterable[Order], upsert: bool = True) -> int:
+        """
+        Insert or update many orders in a single transaction.
+        
+        Args:
+            orders: Order objects to insert
+            upsert: If True, update existing orders; if False, skip existing
+            
+        Returns:
+            Number of rows inserted/updated
+        """
+        now = datetime.now(timezone.utc).isoformat()
+        rows = [self._order_params(order, now) for order in orders]
+        sql = self._UPSERT_SQL if upsert else self._INSERT_IGNORE_SQL
+        
+        with self.get_connection() as conn:
+            before = conn.total_changes
+            conn.executemany(sql, rows)
+            return conn.total_changes - before
+    
+    def begin(self):
+        """Start a transaction that groups subsequent `insert_order` calls."""
+        conn = self.get_connection()
+        if not conn.in_transaction:
+            conn.execute("BEGIN")
+        self._explicit_txn = True
+    
+    def commit(self):
+        """Commit the transaction started by `begin()`."""
+        self.get_connection().commit()
+        self._explicit_txn = False
+    
+    def rollback(self):
+        """Discard the transaction started by `begin()`."""
+        self.get_connection().rollback()
+        self._explicit_txn = False
+    
     def get_existing_order_ids(self) -> Set[str]:
         """Return a set of all existing `order_id` values in the database."""
         with self.get_connection() as conn:
@@ -178,17 +228,12 @@ class OrderDatabase:
         updated = 0
         skipped = 0
         now = datetime.now(timezone.utc).isoformat()
+        rows = []
 
-        # Fetch existing updated_at timestamps to decide if we should update
-        existing_map = {}
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT order_id, updated_at FROM orders")
-            for row in cursor.fetchall():
-                existing_map[row['order_id']] = row['updated_at']
+            # Fetch existing updated_at timestamps to decide if we should update
+            existing_map = dict(conn.execute("SELECT order_id, updated_at FROM orders"))
 
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
             for order in orders:
                 existing_updated_iso = existing_map.get(order.order_id)
                 if existing_updated_iso:
@@ -213,80 +258,59 @@ class OrderDatabase:
                     if incoming_dt and existing_updated_dt and incoming_dt <= existing_updated_dt:
                         skipped += 1
                         continue
-
-                    # Perform update
-                    cursor.execute("""
-                        UPDATE orders SET
-                            order_date = ?,
-                            restaurant_name = ?,
-                            amount = ?,
-                            delivery_fee = ?,
-                            discount = ?,
-                            total_amount = ?,
-                            status = ?,
-                            payment_method = ?,
-                            delivery_location = ?,
-                            order_items = ?,
-                            raw_email_body = ?,
-                            email_date = ?,
-                            updated_at = ?
-                        WHERE order_id = ?
-                    """, (
-                        order.order_date.isoformat(),
-                        order.restaurant_name,
-                        order.amount,
-                        order.delivery_fee,
-                        order.discount,
-                        order.total_amount,
-                        order.status,
-                        order.payment_method,
-                        order.delivery_location,
-                        order.order_items,
-                        order.raw_email_body,
-                        order.email_date.isoformat() if order.email_date else None,
-                        now,
-                        order.order_id
-                    ))
                     updated += 1
                 else:
-                    cursor.execute("""
-                        INSERT INTO orders (
-                            order_id, order_date, restaurant_name, amount,
-                            delivery_fee, discount, total_amount, status,
-                            payment_method, delivery_location, order_items,
-                            raw_email_body, email_date, created_at, updated_at
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        order.order_id,
-                        order.order_date.isoformat(),
-                        order.restaurant_name,
-                        order.amount,
-                        order.delivery_fee,
-                        order.discount,
-                        order.total_amount,
-                        order.status,
-                        order.payment_method,
-                        order.delivery_location,
-                        order.order_items,
-                        order.raw_email_body,
-                        order.email_date.isoformat() if order.email_date else None,
-                        now,
-                        now
-                    ))
                     inserted += 1
+                    # Later duplicates in this batch are treated as existing rows
+                    existing_map[order.order_id] = now
 
-            conn.commit()
+                rows.append(self._order_params(order, now))
+
+            # One UPSERT for every accepted row; updates keep id and created_at
+            conn.executemany(self._UPSERT_SQL, rows)
 
         return inserted, updated, skipped
     
     def get_all_orders(self) -> List[Order]:
-        """Get all orders from database."""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM orders ORDER BY order_date DESC")
-            rows = cursor.fetchall()
-            
-            return [self._row_to_order(row) for row in rows]
+        """
+        Get all orders from database.
+        
+        `raw_email_body` is not loaded and is always None.
+        """
+        return list(self.iter_all_orders())
+    
+    def iter_all_orders(self) -> Iterator[Order]:
+        """
+        Yield all orders one at a time without materializing the result set.
+        
+        `raw_email_body` is not loaded and is always None.
+        """
+        cursor = self.get_connection().cursor()
+        cursor.arraysize = self.FETCH_SIZE
+        cursor.execute(f"SELECT {self._ORDER_COLUMNS} FROM orders ORDER BY order_date DESC")
+        row_to_order = self._row_to_order
+        while True:
+            rows = cursor.fetchmany()
+            if not rows:
+                break
+            for row in rows:
+                yield row_to_order(row)
+    
+    def iter_orders_json(self) -> Iterator[str]:
+        """Yield each order as a JSON object string rendered by SQLite's json1."""
+        cursor = self.get_connection().cursor()
+        cursor.execute("""
+            SELECT json_object(
+                'order_id', order_id,
+                'order_date', order_date,
+                'restaurant', restaurant_name,
+                'total_amount', total_amount,
+                'delivery_fee', delivery_fee,
+                'discount', discount
+            ) FROM orders ORDER BY order_date DESC
+        """)
+        for row in cursor:
+            yield row[0]
     
     def get_orders_by_restaurant(self, restaurant_name: str) -> List[Order]:
         """Get all orders for a specific restaurant."""
@@ -306,9 +330,9 @@ class OrderDatabase:
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT * FROM orders 
-                WHERE strftime('%Y', order_date) = ?
+                WHERE order_year = ?
                 ORDER BY order_date DESC
-            """, (str(year),))
+            """, (year,))
             rows = cursor.fetchall()
             
             return [self._row_to_order(row) for row in rows]
@@ -319,9 +343,9 @@ class OrderDatabase:
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT * FROM orders 
-                WHERE strftime('%Y-%m', order_date) = ?
+                WHERE order_year = ? AND order_month = ?
                 ORDER BY order_date DESC
-            """, (f"{year:04d}-{month:02d}",))
+            """, (year, month))
             rows = cursor.fetchall()
             
             return [self._row_to_order(row) for row in rows]
@@ -333,6 +357,81 @@ class OrderDatabase:
             cursor.execute("SELECT COUNT(*) FROM orders")
             return cursor.fetchone()[0]
     
+    def sum_totals(self) -> Tuple[float, int, float, float]:
+        """
+        Aggregate all orders in one scan.
+        
+        Returns:
+            Tuple of (total_spend, order_count, delivery_fees, discounts)
+        """
+        cursor = self.get_connection().execute("""
+            SELECT TOTAL(total_amount), COUNT(*), TOTAL(delivery_fee), TOTAL(discount)
+            FROM orders
+        """)
+        return tuple(cursor.fetchone())
+    
+    def sum_totals_by_year(self) -> List[Tuple[int, int, float, float, float]]:
+        """
+        Aggregate every order column analytics needs, per year, in one scan.
+        
+        Returns:
+            List of (year, order_count, spend, delivery_fees, discounts) rows
+            ordered by year
+        """
+        cursor = self.get_connection().execute("""
+            SELECT order_year, COUNT(*), TOTAL(total_amount), TOTAL(delivery_fee), TOTAL(discount)
+            FROM orders
+            GROUP BY order_year ORDER BY order_year
+        """)
+        return [tuple(row) for row in cursor]
+    
+    def sum_group_by(self, key: str, year: Optional[int] = None) -> List[Tuple[object, int, float]]:
+        """
+        Aggregate orders per period.
+        
+        Args:
+            key: One of 'year', 'month' or 'month_year'
+            year: Only include orders from this year
+            
+        Returns:
+            List of (period, order_count, spend) rows ordered by period
+        """
+        if key not in self._PERIODS:
+            raise ValueError(f"Unknown period: {key}")
+        column = self._PERIODS[key]
+        where = "WHERE order_year = ?" if year is not None else ""
+        params = (year,) if year is not None else ()
+        cursor = self.get_connection().execute(f"""
+            SELECT {column}, COUNT(*), TOTAL(total_amount)
+            FROM orders {where}
+            GROUP BY {column} ORDER BY {column}
+        """, params)
+        return [tuple(row) for row in cursor]
+    
+    def sum_by_restaurant(self, order_by: str = 'spend', limit: Optional[int] = None) -> List[Tuple[str, float, int]]:
+        """
+        Aggregate orders per restaurant.
+        
+        Ties are broken by the most recent order, matching a stable sort
+        over orders listed newest first.
+        
+        Args:
+            order_by: 'spend' or 'count', sorted descending
+            limit: Maximum number of rows (None for all)
+            
+        Returns:
+            List of (restaurant_name, spend, order_count) rows
+        """
+        column = {'spend': 'spend', 'count': 'cnt'}[order_by]
+        cursor = self.get_connection().execute(f"""
+            SELECT restaurant_name, TOTAL(total_amount) AS spend, COUNT(*) AS cnt
+            FROM orders
+            GROUP BY restaurant_name
+            ORDER BY {column} DESC, MAX(order_date) DESC
+            LIMIT ?
+        """, (-1 if limit is None else limit,))
+        return [tuple(row) for row in cursor]
+    
     def close(self):
         """Close database connection."""
         if self.connection:
@@ -343,6 +442,27 @@ class OrderDatabase:
         """Cleanup on deletion."""
         self.close()
     
+    @staticmethod
+    def _order_params(order: Order, now: str) -> tuple:
+        """Bind parameters for `_INSERT_SQL` in column order."""
+        return (
+            order.order_id,
+            order.order_date.isoformat(),
+            order.restaurant_name,
+            order.amount,
+            order.delivery_fee,
+            order.discount,
+            order.total_amount,
+            order.status,
+            order.payment_method,
+            order.delivery_location,
+            order.order_items,
+            order.raw_email_body,
+            order.email_date.isoformat() if order.email_date else None,
+            now,
+            now
+        )
+    
     @staticmethod
     def _row_to_order(row: sqlite3.Row) -> Order:
         """Convert database row to Order object."""
@@ -6,17 +6,19 @@ The `tools` wrapper should call `run_cli()` or `incremental_import()`.
 from __future__ import annotations
 
 import argparse
+import os
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from typing import Iterable, Optional, Tuple
 
 from zomato_analyzer.config import DATA_DIR, MBOX_PATH
 from zomato_analyzer.parsers.mbox_parser import MBoxParser
-from zomato_analyzer.parsers.zomato import ZomatoEmailParser
 from zomato_analyzer.db.database import OrderDatabase
 
 
 LAST_SYNC_FILE = DATA_DIR / "last_sync.txt"
+# Naive email/order datetimes are taken to be Indian Standard Time
+IST = timezone(timedelta(hours=5, minutes=30))
 
 
 def read_last_sync(path: Path) -> Optional[datetime]:
@@ -44,13 +46,19 @@ def write_last_sync(path: Path, dt: datetime) -> None:
         dt = dt.replace(tzinfo=timezone.utc)
     else:
         dt = dt.astimezone(timezone.utc)
-    path.write_text(dt.isoformat(), encoding='utf-8')
+    # write-then-rename so an interrupted run never leaves a truncated file
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_text(dt.isoformat(), encoding='utf-8')
+    os.replace(tmp, path)
 
 
-def incremental_import(mbox_path: Optional[str] = None, *, force: bool = False) -> Tuple[int, int, int]:
+def incremental_import(mbox_path: Optional[str] = None, *, force: bool = False,
+                       workers: int = 1) -> Tuple[int, int, int]:
     """Perform an incremental import and return (inserted, updated, skipped).
 
     If `force` is True, ignore `last_sync` and reprocess all messages (still idempotent).
+    With `workers` > 1, body decoding and order extraction run in that many
+    processes while the mbox is read on the calling thread.
     """
     mbox_file = mbox_path or MBOX_PATH
     parser = MBoxParser(mbox_file)
@@ -61,26 +69,26 @@ def incremental_import(mbox_path: Optional[str] = None, *, force: bool = False)
     orders = []
     skipped = 0
     newest_order_dt: Optional[datetime] = last_sync
+    utc = timezone.utc
 
-    for subject, from_addr, body, email_dt in parser.parse():
-        if not MBoxParser.validate_email(subject, from_addr):
-            continue
+    def unsynced_emails():
+        nonlocal skipped
+        for subject, from_addr, email_dt, raw in parser.iter_headers(zomato_only=True):
+            # Normalize parsed email header datetime: treat naive datetimes as IST,
+            # then convert to UTC for comparison/storage
+            if email_dt:
+                if email_dt.tzinfo is None:
+                    email_dt = email_dt.replace(tzinfo=IST)
+                email_dt = email_dt.astimezone(utc)
 
-        # Normalize parsed email header datetime: treat naive datetimes as IST
-        IST = timezone(timedelta(hours=5, minutes=30))
-        if email_dt:
-            if email_dt.tzinfo is None:
-                email_dt = email_dt.replace(tzinfo=IST)
-            else:
-                email_dt = email_dt.astimezone(IST)
-            # convert to UTC for comparison/storage
-            email_dt = email_dt.astimezone(timezone.utc)
+                # Already imported: skip before any body extraction
+                if last_sync and email_dt <= last_sync:
+                    skipped += 1
+                    continue
 
-        if email_dt and last_sync and email_dt <= last_sync:
-            skipped += 1
-            continue
+            yield subject, from_addr, email_dt, raw
 
-        order = ZomatoEmailParser.extract_order(subject, from_addr, body, email_dt)
+    for (*_, email_dt), order in parser.extract_orders(unsynced_emails(), workers):
         if not order:
             continue
 
@@ -92,14 +100,12 @@ def incremental_import(mbox_path: Optional[str] = None, *, force: bool = False)
                 od = email_dt
             else:
                 # leave as-is (shouldn't normally happen)
-                od = datetime.now(timezone.utc)
+                od = datetime.now(utc)
 
         # treat naive order dates as IST, then convert to UTC
         if od.tzinfo is None:
             od = od.replace(tzinfo=IST)
-        else:
-            od = od.astimezone(IST)
-        od = od.astimezone(timezone.utc)
+        od = od.astimezone(utc)
         order.order_date = od
 
         orders.append(order)
@@ -112,7 +118,8 @@ def incremental_import(mbox_path: Optional[str] = None, *, force: bool = False)
 
     inserted, updated, skipped_updates = db.bulk_upsert_orders(orders, upsert=force)
 
-    if newest_order_dt:
+    # newest_order_dt starts at last_sync, so only rewrite when it moved
+    if newest_order_dt and (last_sync is None or newest_order_dt > last_sync):
         write_last_sync(LAST_SYNC_FILE, newest_order_dt)
 
     # Combine skipped counts: emails skipped earlier + rows skipped because unchanged
@@ -123,9 +130,11 @@ def run_cli(argv: Optional[Iterable[str]] = None) -> int:
     parser = argparse.ArgumentParser(description='Incremental import of Zomato MBOX (core)')
     parser.add_argument('--mbox', '-m', help='Path to MBOX file', default=None)
     parser.add_argument('--force', '-f', action='store_true', help='Force reprocess all emails')
+    parser.add_argument('--workers', '-j', type=int, default=1,
+                        help='Worker processes for parsing emails (default: %(default)s)')
     args = parser.parse_args(list(argv) if argv else None)
 
-    inserted, updated, skipped = incremental_import(args.mbox, force=args.force)
+    inserted, updated, skipped = incremental_import(args.mbox, force=args.force, workers=args.workers)
     print(f"Inserted={inserted} Updated={updated} Skipped={skipped}")
     return 0
 
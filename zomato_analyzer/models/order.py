@@ -4,7 +4,8 @@ from datetime import datetime
 from typing import Optional
 
 
-@dataclass
+# slots=True needs Python 3.10; see README
+@dataclass(slots=True)
 class Order:
     """Represents a Zomato order."""
     order_id: str
@@ -34,4 +35,5 @@ class Order:
     @property
     def month_year(self) -> str:
         """Return month-year string."""
-        return self.order_date.strftime("%Y-%m")
+        order_date = self.order_date
+        return f"{order_date.year:04d}-{order_date.month:02d}"
@@ -1,83 +1,263 @@
 """MBOX file parser."""
-import mailbox
+import mmap
 import quopri
+import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Generator, Tuple, Optional
+from typing import Generator, Iterable, Iterator, List, Tuple, Optional
 from datetime import datetime
+from email.parser import BytesHeaderParser, BytesParser
 from email.utils import parsedate_to_datetime
 
+from zomato_analyzer.models.order import Order
+from zomato_analyzer.parsers.zomato import ZomatoEmailParser, map_in_chunks
+
+# (subject, from_addr, email_date, raw_message) as yielded by MBoxParser.iter_headers()
+RawMessage = Tuple[str, str, Optional[datetime], bytes]
+
+
+# Lowercase words that mark a sender's mail in its From or Subject header;
+# validate_email and the raw-header prefilter both read this list
+SENDER_INDICATORS = ('zomato',)
+# Matches any header validate_email accepts, in raw bytes too
+_SENDER_BYTES_RE = re.compile(
+    b'|'.join(re.escape(word.encode('ascii')) for word in SENDER_INDICATORS), re.IGNORECASE
+)
+# Blank line ending a message's header block
+_HEADER_END_RE = re.compile(rb'\r?\n\r?\n')
+
+# Soft line breaks / encoded '=' betray quoted-printable sent without its
+# Content-Transfer-Encoding header; only the start of a body is sniffed
+_QP_SNIFF_RE = re.compile(r'=(?:\r?\n|3D)')
+QP_SNIFF_CHARS = 4096
+
+
+# Charsets decoded as UTF-8: undeclared, and ASCII, which senders often
+# declare for bodies that still carry UTF-8 (every ₹ would be lost otherwise)
+_UTF8_CHARSETS = frozenset((None, 'utf-8', 'utf8', 'us-ascii', 'ascii'))
+
+
+def _decode_bytes(data: bytes, charset: str) -> str:
+    """Decode `data` as `charset`, using UTF-8 if Python does not know it."""
+    try:
+        return data.decode(charset, errors='ignore')
+    except LookupError:
+        return data.decode('utf-8', errors='ignore')
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_header(date_header: str) -> datetime:
+    """Parse an RFC 2822 Date header; memoized since headers repeat a lot."""
+    return parsedate_to_datetime(date_header)
+
 
 class MBoxParser:
     """Parser for MBOX email files."""
     
+    # compat32 parsers keep no state between messages, so one pair serves
+    # every instance and the worker processes of `extract_orders`
+    _header_parser = BytesHeaderParser()
+    _bytes_parser = BytesParser()
+    
     def __init__(self, mbox_path: str):
         """Initialize MBOX parser."""
         self.mbox_path = Path(mbox_path)
         
         if not self.mbox_path.exists():
             raise FileNotFoundError(f"MBOX file not found: {self.mbox_path}")
+        
+        # Messages dropped by the last `parse(zomato_only=True)` run
+        self.filtered = 0
     
-    def parse(self) -> Generator[Tuple[str, str, str, Optional[datetime]], None, None]:
+    def iter_raw_messages(self) -> Iterator[bytes]:
         """
-        Parse MBOX file and yield email data.
+        Yield the raw bytes of each message, without its `From ` line.
+        
+        The file is memory-mapped and split on lines starting with `From `,
+        following the same boundary rules as `mailbox.mbox`.
+        """
+        with open(self.mbox_path, 'rb') as f:
+            if self.mbox_path.stat().st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                size = len(mm)
+                if mm[:5] == b'From ':
+                    pos = 0
+                else:
+                    pos = mm.find(b'\nFrom ')
+                    pos = pos + 1 if pos != -1 else -1
+                
+                while pos != -1:
+                    start = mm.find(b'\n', pos) + 1 or size
+                    nxt = mm.find(b'\nFrom ', start - 1)
+                    line_start = nxt + 1 if nxt != -1 else size
+                    # A blank line before the next `From ` line (or EOF) is a separator
+                    if line_start - 1 >= start and mm[line_start - 2:line_start] == b'\n\n':
+                        yield mm[start:line_start - 1]
+                    else:
+                        yield mm[start:line_start]
+                    pos = line_start if nxt != -1 else -1
+    
+    def iter_headers(self, zomato_only: bool = False) -> Iterator[Tuple[str, str, Optional[datetime], bytes]]:
+        """
+        Yield each message's headers without decoding its body.
+        
+        Only the header block is parsed; pass the raw message to
+        `decode_body` for the messages that are still wanted.
+        
+        Args:
+            zomato_only: If True, skip messages rejected by `validate_email`
         
         Yields:
-            Tuple of (subject, from_address, body, email_date)
-            where `email_date` is a parsed `datetime` when available.
+            Tuple of (subject, from_address, email_date, raw_message)
         """
+        self.filtered = 0
         try:
-            mbox = mailbox.mbox(str(self.mbox_path))
-            
-            for message in mbox:
-                subject = message.get('subject', '')
-                from_addr = message.get('from', '')
-                date_header = message.get("Date")
+            for raw in self.iter_raw_messages():
+                match = _HEADER_END_RE.search(raw)
+                header_end = match.end() if match else len(raw)
+                
+                if zomato_only and not _SENDER_BYTES_RE.search(raw, 0, header_end):
+                    # Reject on the raw header bytes before parsing anything
+                    self.filtered += 1
+                    continue
+                
+                headers = self._header_parser.parsebytes(raw[:header_end])
+                subject = headers.get('subject', '')
+                from_addr = headers.get('from', '')
+                if zomato_only and not self.validate_email(subject, from_addr):
+                    self.filtered += 1
+                    continue
+                
+                date_header = headers.get("Date")
 
                 # Parse date header into datetime if possible
                 email_dt: Optional[datetime] = None
                 if date_header:
                     try:
-                        email_dt = parsedate_to_datetime(date_header)
+                        email_dt = _parse_date_header(str(date_header))
                     except Exception:
                         email_dt = None
                 
-                # Extract email body
-                body = ""
-                if message.is_multipart():
-                    for part in message.walk():
-                        ctype = part.get_content_type()
-                        if ctype == 'text/plain':
-                            payload = part.get_payload(decode=True)
-                            if payload:
-                                body = payload.decode('utf-8', errors='ignore')
-                                break
-                        elif ctype == 'text/html' and not body:
-                            payload = part.get_payload(decode=True)
-                            if payload:
-                                body = payload.decode('utf-8', errors='ignore')
-                else:
-                    payload = message.get_payload(decode=True)
-                    if payload:
-                        body = payload.decode('utf-8', errors='ignore')
-                
-                # Handle quoted-printable encoding if present
-                if '=' in body and body.count('=') > 5:  # Likely quoted-printable
-                    try:
-                        body = quopri.decodestring(body.encode()).decode('utf-8', errors='ignore')
-                    except Exception:
-                        pass  # If decoding fails, keep original
-                
-                yield subject, from_addr, body, email_dt
+                yield subject, from_addr, email_dt, raw
         
         except Exception as e:
             raise RuntimeError(f"Error parsing MBOX file: {e}")
     
+    @classmethod
+    def decode_body(cls, raw: bytes) -> str:
+        """Return the text body of a raw message, preferring text/plain over HTML."""
+        message = cls._bytes_parser.parsebytes(raw)
+        body = ""
+        if message.is_multipart():
+            for part in message.walk():
+                ctype = part.get_content_type()
+                if ctype == 'text/plain':
+                    text = cls._decode_part(part)
+                    if text:
+                        body = text
+                        break
+                elif ctype == 'text/html' and not body:
+                    body = cls._decode_part(part)
+        else:
+            body = cls._decode_part(message)
+        return body
+    
+    def parse(self, zomato_only: bool = False) -> Generator[Tuple[str, str, str, Optional[datetime]], None, None]:
+        """
+        Parse MBOX file and yield email data.
+        
+        Args:
+            zomato_only: If True, apply `validate_email` to the headers and
+                skip non-Zomato messages before their body is decoded
+        
+        Yields:
+            Tuple of (subject, from_address, body, email_date)
+            where `email_date` is a parsed `datetime` when available.
+        """
+        for subject, from_addr, email_dt, raw in self.iter_headers(zomato_only):
+            try:
+                body = self.decode_body(raw)
+            except Exception as e:
+                raise RuntimeError(f"Error parsing MBOX file: {e}")
+            yield subject, from_addr, body, email_dt
+    
+    def extract_orders(self, messages: Optional[Iterable[RawMessage]] = None,
+                       workers: int = 1) -> Iterator[Tuple[Tuple[str, str, Optional[datetime]], Optional[Order]]]:
+        """
+        Decode and extract the order of each message, optionally in worker processes.
+        
+        Workers receive the raw message bytes, so body decoding runs in
+        parallel along with `ZomatoEmailParser.extract_order`.
+        
+        Args:
+            messages: (subject, from_address, email_date, raw_message) tuples
+                as yielded by `iter_headers`; defaults to the Zomato messages
+            workers: Number of worker processes; 1 parses in-process
+            
+        Yields:
+            ((subject, from_address, email_date), order) pairs in input
+            order; order is None if unparsed
+        """
+        if messages is None:
+            messages = self.iter_headers(zomato_only=True)
+        
+        if workers <= 1:
+            results = ((message, _extract_raw_chunk([message])[0]) for message in messages)
+        else:
+            results = map_in_chunks(_extract_raw_chunk, messages, workers)
+        for (subject, from_addr, email_dt, _), order in results:
+            yield (subject, from_addr, email_dt), order
+    
+    def iter_orders(self, workers: int = 1) -> Iterator[Order]:
+        """
+        Yield the orders found in Zomato messages, one message at a time.
+        
+        Nothing is collected, so each body can be freed as soon as its
+        order is extracted. Use `parse` when the messages themselves are
+        needed.
+        
+        Args:
+            workers: Worker processes for order extraction; see
+                `extract_orders`
+        """
+        for _, order in self.extract_orders(workers=workers):
+            if order is not None:
+                yield order
+    
+    @staticmethod
+    def _decode_part(part) -> str:
+        """
+        Decode a message part's payload to text.
+        
+        get_payload(decode=True) undoes the declared transfer encoding;
+        quoted-printable is additionally decoded when it was not declared.
+        Bytes are decoded with the part's declared charset, falling back to
+        UTF-8 when it is missing or unknown.
+        """
+        payload = part.get_payload(decode=True)
+        if not payload:
+            return ""
+        charset = part.get_content_charset()
+        if charset in _UTF8_CHARSETS:
+            charset = 'utf-8'
+        body = _decode_bytes(payload, charset)
+        cte = part.get('content-transfer-encoding', '').strip().lower()
+        if cte not in ('quoted-printable', 'base64') and _QP_SNIFF_RE.search(body, 0, QP_SNIFF_CHARS):
+            body = _decode_bytes(quopri.decodestring(payload), charset)
+        return body
+    
     @staticmethod
     def validate_email(subject: str, from_addr: str) -> bool:
-        """Check if email appears to be from Zomato."""
-        zomato_indicators = [
-            'zomato' in subject.lower(),
-            'zomato' in from_addr.lower(),
-            'order' in subject.lower() and 'zomato' in from_addr.lower()
-        ]
-        return any(zomato_indicators)
+        """Check if email appears to be from Zomato (any of `SENDER_INDICATORS`)."""
+        from_addr = from_addr.lower()
+        if any(word in from_addr for word in SENDER_INDICATORS):
+            return True
+        subject = subject.lower()
+        return any(word in subject for word in SENDER_INDICATORS)
+
+
+def _extract_raw_chunk(chunk: List[RawMessage]) -> List[Optional[Order]]:
+    """Worker-process entry point for `MBoxParser.extract_orders`."""
+    return [ZomatoEmailParser.extract_order(subject, from_addr, MBoxParser.decode_body(raw), email_dt)
+            for subject, from_addr, email_dt, raw in chunk]
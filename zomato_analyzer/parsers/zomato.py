@@ -1,41 +1,42 @@
 """Zomato email parser to extract order information."""
 import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Optional
-from html.parser import HTMLParser
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, TypeVar
 
 from zomato_analyzer.models.order import Order
 
+# (subject, from_addr, body, email_date) as yielded by MBoxParser.parse()
+Email = Tuple[str, str, str, Optional[datetime]]
 
-class HTMLTextExtractor(HTMLParser):
-    """Extract text content from HTML."""
-    def __init__(self):
-        super().__init__()
-        self.text = []
-    
-    def handle_data(self, data):
-        self.text.append(data)
-    
-    def get_text(self):
-        return ' '.join(self.text)
+# Emails handed to a worker process per task
+EXTRACT_CHUNK_SIZE = 64
+
+T = TypeVar('T')
+R = TypeVar('R')
 
 
 class ZomatoEmailParser:
     """Parser for Zomato order confirmation emails."""
     
-    # Patterns to extract order information (works with both plain text and HTML)
+    # Patterns to extract order information (works with both plain text and HTML).
+    # Runs between a label and its value, and the restaurant name, have an
+    # upper bound so a body full of repeated labels cannot make a search
+    # quadratic.
     ORDER_ID_PATTERN = r'ORDER\s+ID:?\s*#?([A-Z0-9]{5,})'
-    RESTAURANT_PATTERN = r'(?:Thank you for ordering (?:from)?|from)\s+([A-Za-z0-9\s&\-,.\']+?)(?:\s+ORDER|\s+Delivered|$)'
+    RESTAURANT_PATTERN = r'(?:Thank you for ordering (?:from)?|from)\s+([A-Za-z0-9\s&\-,.\']{1,200}?)(?:\s+ORDER|\s+Delivered|$)'
     RESTAURANT_IN_TAGS = r'<b>([A-Za-z0-9\s&\-,.\']+?)</b>'
     # Match 'Total paid', 'Total Amount' or 'Paid ₹...' as fallback
     TOTAL_AMOUNT_PATTERN = (
         r'(?:Total\s+(?:paid|amount|bill)?|Grand\s+Total|Total\s+Amount)'
-        r'[\s\w\-:]*?₹\s*([\d,]+(?:\.\d{1,2})?)'
+        r'[\s\w\-:]{0,100}?₹\s*([\d,]+(?:\.\d{1,2})?)'
     )
     PAID_AMOUNT_PATTERN = r'Paid[\s:]*₹\s*([\d,]+(?:\.\d{1,2})?)'
-    DELIVERY_FEE_PATTERN = r'(?:Delivery\s+(?:Charges|Fee|Charge))[\s\w\-:]*?₹\s*([\d,]+\.?\d*)'
-    DISCOUNT_PATTERN = r'(?:Discount|Promo)[\s\w\-:]*?₹\s*([\d,]+\.?\d*)'
-    DATE_PATTERN = r'(?:Order|Ordered|Issued|31\s+Jul|[0-3]?\d\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec|January|February|March|April|May|June|July|August|September|October|November|December))[^\d]*?([0-3]?\d\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec|January|February|March|April|May|June|July|August|September|October|November|December)[^\d]*\d{4}[^>]*)'
+    DELIVERY_FEE_PATTERN = r'(?:Delivery\s+(?:Charges|Fee|Charge))[\s\w\-:]{0,100}?₹\s*([\d,]+\.?\d*)'
+    DISCOUNT_PATTERN = r'(?:Discount|Promo)[\s\w\-:]{0,100}?₹\s*([\d,]+\.?\d*)'
+    DATE_PATTERN = r'(?:Order|Ordered|Issued|31\s+Jul|[0-3]?\d\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec|January|February|March|April|May|June|July|August|September|October|November|December))[^\d]{0,100}?([0-3]?\d\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec|January|February|March|April|May|June|July|August|September|October|November|December)[^\d]*\d{4}[^>]*)'
     
     @staticmethod
     def extract_order(subject: str, from_addr: str, body: str, 
@@ -53,8 +54,14 @@ class ZomatoEmailParser:
             Order object if successfully parsed, None otherwise
         """
         try:
+            # Skip the HTML cleanup and regex passes for non-order mail
+            if not ZomatoEmailParser.could_be_order(body):
+                return None
+            
             # Convert HTML to plain text if needed
             clean_body = ZomatoEmailParser._convert_html_to_text(body)
+            # Lowered once for the extractors' substring pre-checks
+            lowered = clean_body.lower()
             
             # Extract order ID from subject or body
             order_id = ZomatoEmailParser._extract_order_id(subject, clean_body)
@@ -71,8 +78,8 @@ class ZomatoEmailParser:
             if total_amount is None:
                 return None
             
-            delivery_fee = ZomatoEmailParser._extract_delivery_fee(clean_body)
-            discount = ZomatoEmailParser._extract_discount(clean_body)
+            delivery_fee = ZomatoEmailParser._extract_delivery_fee(clean_body, lowered)
+            discount = ZomatoEmailParser._extract_discount(clean_body, lowered)
             
             # Calculate food amount
             amount = total_amount - delivery_fee + discount
@@ -100,44 +107,71 @@ class ZomatoEmailParser:
             print(f"Error parsing Zomato email: {e}")
             return None
     
+    @staticmethod
+    def could_be_order(body: str) -> bool:
+        """
+        Cheap pre-check run before `extract_order` does any regex work.
+        
+        Every amount pattern requires a literal ₹ and the HTML cleanup never
+        produces one, so a body without it can never yield an order.
+        """
+        return '₹' in body
+    
+    @staticmethod
+    def extract_orders(emails: Iterable[Email], workers: int = 1) -> Iterator[Tuple[Email, Optional[Order]]]:
+        """
+        Run `extract_order` over many emails, optionally in worker processes.
+        
+        Args:
+            emails: (subject, from_addr, body, email_date) tuples
+            workers: Number of worker processes; 1 parses in-process
+            
+        Yields:
+            (email, order) pairs in input order; order is None if unparsed
+        """
+        if workers <= 1:
+            for email in emails:
+                yield email, ZomatoEmailParser.extract_order(*email)
+            return
+        
+        # Only ship bodies that can parse; the rest are known misses
+        yield from map_in_chunks(_extract_chunk, emails, workers,
+                                 keep=lambda email: ZomatoEmailParser.could_be_order(email[2]))
+    
     @staticmethod
     def _convert_html_to_text(body: str) -> str:
         """Convert HTML body to plain text while preserving structure."""
         # Decode HTML entities first
-        body = body.replace('&amp;', '&')
-        body = body.replace('&lt;', '<')
-        body = body.replace('&gt;', '>')
-        body = body.replace('&quot;', '"')
-        body = body.replace('&#39;', "'")
+        if '&' in body:
+            body = body.replace('&amp;', '&')
+            body = body.replace('&lt;', '<')
+            body = body.replace('&gt;', '>')
+            body = body.replace('&quot;', '"')
+            body = body.replace('&#39;', "'")
         
-        # Simple HTML cleanup: replace common HTML patterns with spaces
-        body = re.sub(r'<br\s*/?>', ' ', body, flags=re.IGNORECASE)
-        body = re.sub(r'<p[^>]*>', ' ', body, flags=re.IGNORECASE)
-        body = re.sub(r'</p>', ' ', body, flags=re.IGNORECASE)
-        body = re.sub(r'<td[^>]*>', ' ', body, flags=re.IGNORECASE)
-        body = re.sub(r'</td>', ' ', body, flags=re.IGNORECASE)
-        body = re.sub(r'<tr[^>]*>', ' ', body, flags=re.IGNORECASE)
-        body = re.sub(r'</tr>', ' ', body, flags=re.IGNORECASE)
-        body = re.sub(r'<[^>]+>', '', body)  # Remove remaining HTML tags
-        body = re.sub(r'\s+', ' ', body)  # Normalize whitespace
+        # Simple HTML cleanup: line/cell breaks become spaces, other tags vanish
+        if '<' in body:
+            body = _BLOCK_TAG_RE.sub(' ', body)
+            body = _TAG_RE.sub('', body)  # Remove remaining HTML tags
+        body = _WS_RE.sub(' ', body)  # Normalize whitespace
         return body.strip()
     
     @staticmethod
     def _extract_order_id(subject: str, body: str) -> Optional[str]:
         """Extract order ID from subject or body."""
         # Try subject first
-        match = re.search(ZomatoEmailParser.ORDER_ID_PATTERN, subject, re.IGNORECASE)
+        match = _ORDER_ID_RE.search(subject)
         if match:
             return match.group(1).strip()
         
         # Try body
-        match = re.search(ZomatoEmailParser.ORDER_ID_PATTERN, body, re.IGNORECASE)
+        match = _ORDER_ID_RE.search(body)
         if match:
             return match.group(1).strip()
         
         # Try to extract from email subject (new pattern format)
         # e.g., "Your Zomato order from Restaurant Name"
-        match = re.search(r'order\s+#?([A-Z0-9]+)', subject, re.IGNORECASE)
+        match = _SUBJECT_ORDER_ID_RE.search(subject)
         if match:
             return match.group(1).strip()
         
@@ -147,31 +181,31 @@ class ZomatoEmailParser:
     def _extract_restaurant(body: str, subject: str = "") -> Optional[str]:
         """Extract restaurant name from body or subject."""
         # Prefer subject-based extraction for Pro Plus emails
-        msub = re.search(r'pro\s+plus\s+order\s+from\s+(.+)$', subject, re.IGNORECASE)
+        msub = _SUBJECT_PRO_PLUS_RE.search(subject)
         if msub:
             restaurant = msub.group(1).strip()
-            restaurant = re.sub(r'^[\-:\s]+', '', restaurant)
-            restaurant = re.sub(r'\s+', ' ', restaurant).strip()
+            restaurant = _LEADING_PUNCT_RE.sub('', restaurant)
+            restaurant = _WS_RE.sub(' ', restaurant).strip()
             if 2 < len(restaurant) < 120:
                 return restaurant
 
         # Try pattern: "Thank you for ordering from Restaurant Name"
-        match = re.search(ZomatoEmailParser.RESTAURANT_PATTERN, body, re.IGNORECASE)
+        match = _RESTAURANT_RE.search(body)
         if match:
             restaurant = match.group(1).strip()
             # strip leading punctuation (some templates include a leading hyphen)
-            restaurant = re.sub(r'^[\-:\s]+', '', restaurant)
-            restaurant = re.sub(r'\s+', ' ', restaurant).strip()
+            restaurant = _LEADING_PUNCT_RE.sub('', restaurant)
+            restaurant = _WS_RE.sub(' ', restaurant).strip()
             if 2 < len(restaurant) < 120:  # Sanity check
                 return restaurant
         
         # Try to extract from subject line
         # "Your Zomato order from Restaurant Name" or similar
-        match = re.search(r'from\s+([A-Za-z0-9\s&\-,.\'\"]+)$', subject, re.IGNORECASE)
+        match = _SUBJECT_FROM_RE.search(subject)
         if match:
             restaurant = match.group(1).strip()
-            restaurant = re.sub(r'^[\-:\s]+', '', restaurant)
-            restaurant = re.sub(r'\s+', ' ', restaurant).strip()
+            restaurant = _LEADING_PUNCT_RE.sub('', restaurant)
+            restaurant = _WS_RE.sub(' ', restaurant).strip()
             if 2 < len(restaurant) < 120:
                 return restaurant
         
@@ -179,99 +213,232 @@ class ZomatoEmailParser:
     
     @staticmethod
     def _extract_total_amount(body: str) -> Optional[float]:
-        body = re.sub(r'\s+', ' ', body)
-        """Extract total amount from body."""
+        """Extract total amount from body already cleaned by `_convert_html_to_text`."""
+        # Both patterns need a ₹; tag stripping can remove the one could_be_order saw
+        if '₹' not in body:
+            return None
+        
         # Fallback: look for 'Paid ₹...' which appears in Pro Plus templates
-        match = re.search(ZomatoEmailParser.PAID_AMOUNT_PATTERN, body, re.IGNORECASE)
+        match = _PAID_AMOUNT_RE.search(body)
         if match:
-            amount_str = match.group(1).replace(',', '')
-            try:
-                return float(amount_str)
-            except ValueError:
-                pass
+            amount = _parse_amount(match.group(1))
+            if amount is not None:
+                return amount
         
         # Primary pattern
-        match = re.search(ZomatoEmailParser.TOTAL_AMOUNT_PATTERN, body, re.IGNORECASE)
+        match = _TOTAL_AMOUNT_RE.search(body)
         if match:
-            amount_str = match.group(1).replace(',', '')
-            try:
-                return float(amount_str)
-            except ValueError:
-                pass
+            amount = _parse_amount(match.group(1))
+            if amount is not None:
+                return amount
 
         return None
     
     @staticmethod
-    def _extract_delivery_fee(body: str) -> float:
-        """Extract delivery fee from body."""
-        match = re.search(ZomatoEmailParser.DELIVERY_FEE_PATTERN, body, re.IGNORECASE)
+    def _extract_delivery_fee(body: str, lowered: Optional[str] = None) -> float:
+        """Extract delivery fee from body; `lowered` is `body.lower()` if already computed."""
+        # Pre-checks skip 'i' and 's', which IGNORECASE also equates with 'ı' and 'ſ'
+        if 'very' not in (body.lower() if lowered is None else lowered):
+            return 0.0
+        
+        match = _DELIVERY_FEE_RE.search(body)
         if match:
-            try:
-                fee_str = match.group(1).replace(',', '')
-                return float(fee_str)
-            except ValueError:
-                pass
+            fee = _parse_amount(match.group(1))
+            if fee is not None:
+                return fee
         
         return 0.0
     
     @staticmethod
-    def _extract_discount(body: str) -> float:
-        """Extract discount from body."""
-        match = re.search(ZomatoEmailParser.DISCOUNT_PATTERN, body, re.IGNORECASE)
+    def _extract_discount(body: str, lowered: Optional[str] = None) -> float:
+        """Extract discount from body; `lowered` is `body.lower()` if already computed."""
+        lowered = body.lower() if lowered is None else lowered
+        if 'count' not in lowered and 'promo' not in lowered:
+            return 0.0
+        
+        match = _DISCOUNT_RE.search(body)
         if match:
-            try:
-                discount_str = match.group(1).replace(',', '')
-                return float(discount_str)
-            except ValueError:
-                pass
+            discount = _parse_amount(match.group(1))
+            if discount is not None:
+                return discount
         
         return 0.0
     
     @staticmethod
     def _extract_order_date(body: str, email_date: Optional[datetime] = None) -> datetime:
-        """Extract order date from body or use email date as fallback."""
-
-        # Normalize HTML early
-        body = re.sub(r'<[^>]+>', ' ', body)
-        body = re.sub(r'\s+', ' ', body).strip()
+        """
+        Extract order date from body or use email date as fallback.
+        
+        The body comes from `_convert_html_to_text`, so it is already
+        whitespace-collapsed and tag-free unless stripping nested tags left one.
+        """
+        if '<' in body:
+            body = _TAG_RE.sub(' ', body)
+            body = _WS_RE.sub(' ', body).strip()
 
         # Try detailed formats first
-        match = re.search(ZomatoEmailParser.DATE_PATTERN, body, re.IGNORECASE)
+        match = _DATE_RE.search(body)
         if match:
-            date_str = match.group(1).strip()
-
-            for date_format in [
-                '%d %b %Y, %I:%M %p',
-                '%d %B %Y, %I:%M %p',
-                '%d-%m-%Y, %H:%M',
-                '%d/%m/%Y, %H:%M',
-                '%d %b %Y',
-                '%d %B %Y',
-                '%d %b %Y, %H:%M',
-                '%d %B %Y, %H:%M',
-                '%d %b, %I:%M %p',      # no year
-                '%d %B, %I:%M %p'
-            ]:
-                try:
-                    parsed = datetime.strptime(date_str, date_format)
-                    if '%Y' not in date_format and email_date:
-                        parsed = parsed.replace(year=email_date.year)
-                    return parsed
-                except ValueError:
-                    continue
+            parsed = _parse_date_string(match.group(1).strip(), email_date.year if email_date else None)
+            if parsed:
+                return parsed
 
         # Simpler fallback (date only)
-        simple_date_pattern = r'(\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*)'
-        match = re.search(simple_date_pattern, body, re.IGNORECASE)
+        match = _SIMPLE_DATE_RE.search(body)
         if match and email_date:
-            try:
-                parsed = datetime.strptime(match.group(1), '%d %b')
-                return parsed.replace(year=email_date.year)
-            except ValueError:
-                pass
+            # Same as strptime(..., '%d %b'): trailing letters ('March') fail
+            day_month = _DAY_MONTH_RE.fullmatch(match.group(1))
+            if day_month:
+                try:
+                    parsed = datetime(1900, _MONTH_NUMBERS[day_month.group(2).lower()], int(day_month.group(1)))
+                    return parsed.replace(year=email_date.year)
+                except (KeyError, ValueError):
+                    pass
 
         # Correct fallback
         if email_date:
             return email_date
 
-        raise ValueError("Unable to determine order date")
\ No newline at end of file
+        raise ValueError("Unable to determine order date")
+
+
+# Every pattern the parser uses, compiled once at import. The *_PATTERN
+# strings stay on the class for extensions that build on them.
+_ORDER_ID_RE = re.compile(ZomatoEmailParser.ORDER_ID_PATTERN, re.IGNORECASE)
+_RESTAURANT_RE = re.compile(ZomatoEmailParser.RESTAURANT_PATTERN, re.IGNORECASE)
+_TOTAL_AMOUNT_RE = re.compile(ZomatoEmailParser.TOTAL_AMOUNT_PATTERN, re.IGNORECASE)
+_PAID_AMOUNT_RE = re.compile(ZomatoEmailParser.PAID_AMOUNT_PATTERN, re.IGNORECASE)
+_DELIVERY_FEE_RE = re.compile(ZomatoEmailParser.DELIVERY_FEE_PATTERN, re.IGNORECASE)
+_DISCOUNT_RE = re.compile(ZomatoEmailParser.DISCOUNT_PATTERN, re.IGNORECASE)
+_DATE_RE = re.compile(ZomatoEmailParser.DATE_PATTERN, re.IGNORECASE)
+_SIMPLE_DATE_RE = re.compile(r'(\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*)', re.IGNORECASE)
+
+# Month names as strptime's %B and %b read them in the C locale
+_MONTH_NAMES = ('January', 'February', 'March', 'April', 'May', 'June', 'July',
+                'August', 'September', 'October', 'November', 'December')
+_MONTH_NUMBERS = {name.lower(): number for number, name in enumerate(_MONTH_NAMES, 1)}
+_MONTH_NUMBERS.update((name[:3].lower(), number) for number, name in enumerate(_MONTH_NAMES, 1))
+# The shapes of every order date format, with strptime's field patterns:
+#   '%d %b %Y', '%d %B %Y', each optionally followed by ', %I:%M %p' or ', %H:%M'
+#   '%d %b, %I:%M %p', '%d %B, %I:%M %p'   (no year)
+#   '%d-%m-%Y, %H:%M', '%d/%m/%Y, %H:%M'
+_DATE_STRING_RE = re.compile(
+    r'(?P<day>3[01]|[12]\d|0[1-9]|[1-9]| [1-9])'
+    r'(?:\s+(?P<month_name>' + '|'.join(_MONTH_NAMES) + '|' + '|'.join(name[:3] for name in _MONTH_NAMES) + r')'
+    r'(?:\s+(?P<year>\d{4}))?'
+    r'|(?P<sep>[-/])(?P<month>1[0-2]|0[1-9]|[1-9])(?P=sep)(?P<numeric_year>\d{4}))'
+    r'(?:,\s+(?P<hour>\d{1,2}):(?P<minute>[0-5]\d|\d)(?:\s+(?P<ampm>am|pm))?)?',
+    re.IGNORECASE,
+)
+_DAY_MONTH_RE = re.compile(
+    r'(3[01]|[12]\d|0[1-9]|[1-9]| [1-9])\s+(' + '|'.join(name[:3] for name in _MONTH_NAMES) + ')',
+    re.IGNORECASE,
+)
+
+_SUBJECT_ORDER_ID_RE = re.compile(r'order\s+#?([A-Z0-9]+)', re.IGNORECASE)
+_SUBJECT_PRO_PLUS_RE = re.compile(r'pro\s+plus\s+order\s+from\s+(.+)$', re.IGNORECASE)
+_SUBJECT_FROM_RE = re.compile(r'from\s+([A-Za-z0-9\s&\-,.\'\"]+)$', re.IGNORECASE)
+_LEADING_PUNCT_RE = re.compile(r'^[\-:\s]+')
+
+# <br>, <p>, <td>, <tr> and their closing tags, in one alternation
+_BLOCK_TAG_RE = re.compile(r'<(?:br\s*/?|(?:p|td|tr)[^>]*|/(?:p|td|tr))>', re.IGNORECASE)
+_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+
+
+def _parse_amount(amount_str: str) -> Optional[float]:
+    """
+    Convert a captured amount such as '1,234.50' to a float.
+    
+    The amount patterns admit captures with no digits (',' or '.'); those
+    give None instead of raising from float().
+    """
+    amount_str = amount_str.replace(',', '')
+    return float(amount_str) if amount_str.strip('.') else None
+
+
+def _parse_date_string(date_str: str, year: Optional[int] = None) -> Optional[datetime]:
+    """
+    Parse a `DATE_PATTERN` capture, or return None if no order date format fits.
+    
+    Gives the same result as trying `datetime.strptime` with each format
+    listed above `_DATE_STRING_RE`, but the string's shape selects the
+    format. Dates without a year take `year` when it is given.
+    """
+    match = _DATE_STRING_RE.fullmatch(date_str)
+    if not match:
+        return None
+    
+    hour = minute = 0
+    ampm = match.group('ampm')
+    if match.group('hour') is not None:
+        hour = int(match.group('hour'))
+        minute = int(match.group('minute'))
+        if ampm:
+            if not 1 <= hour <= 12:
+                return None
+            hour = hour % 12 + (12 if ampm.lower() == 'pm' else 0)
+        elif hour > 23:
+            return None
+    
+    try:
+        if match.group('month_name') is None:
+            # dd-mm-yyyy and dd/mm/yyyy always carry a 24-hour time
+            if match.group('hour') is None or ampm:
+                return None
+            return datetime(int(match.group('numeric_year')), int(match.group('month')),
+                            int(match.group('day')), hour, minute)
+        
+        month = _MONTH_NUMBERS.get(match.group('month_name').lower())
+        if month is None:
+            return None
+        if match.group('year') is not None:
+            return datetime(int(match.group('year')), month, int(match.group('day')), hour, minute)
+        
+        # Only the 12-hour formats may leave out the year; like strptime,
+        # check the date against 1900 before moving it to `year`
+        if not ampm:
+            return None
+        parsed = datetime(1900, month, int(match.group('day')), hour, minute)
+        return parsed.replace(year=year) if year else parsed
+    except ValueError:
+        return None
+
+
+def map_in_chunks(func: Callable[[List[T]], List[R]], items: Iterable[T], workers: int,
+                  keep: Optional[Callable[[T], bool]] = None) -> Iterator[Tuple[T, Optional[R]]]:
+    """
+    Run `func` over `items` in worker processes, EXTRACT_CHUNK_SIZE at a time.
+    
+    Args:
+        func: Module-level function mapping a list of items to their results
+        items: Items to process; read lazily
+        workers: Number of worker processes
+        keep: Optional parent-side filter; rejected items are not sent
+            and get a None result
+        
+    Yields:
+        (item, result) pairs in input order
+    """
+    items = iter(items)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Bound the number of in-flight chunks so the input is not read ahead
+        pending = deque()
+        while True:
+            chunk = list(islice(items, EXTRACT_CHUNK_SIZE))
+            if chunk:
+                flags = [keep(item) for item in chunk] if keep else [True] * len(chunk)
+                sent = [item for item, flag in zip(chunk, flags) if flag]
+                pending.append((chunk, flags, executor.submit(func, sent)))
+            if pending and (not chunk or len(pending) >= workers * 2):
+                done, flags, future = pending.popleft()
+                results = iter(future.result())
+                for item, flag in zip(done, flags):
+                    yield item, next(results) if flag else None
+            if not chunk and not pending:
+                break
+
+
+def _extract_chunk(chunk: List[Email]) -> List[Optional[Order]]:
+    """Worker-process entry point for `ZomatoEmailParser.extract_orders`."""
+    return [ZomatoEmailParser.extract_order(*email) for email in chunk]